@@ -15,7 +15,8 @@ class NumericInterval(DimensionModifier):
                     self.offset == other.offset])
 
     def __hash__(self):
-        return hash(repr(self))
+        # Only hash what `__eq__` compares, so that equal intervals have equal hashes
+        return hash((NumericInterval, self.size, self.offset))
 
 
 DATETIME_INTERVALS = ('hour', 'day', 'week', 'month', 'quarter', 'year')
@@ -31,12 +32,12 @@ class DatetimeInterval(DimensionModifier):
                and self.alias == other.alias
 
     def __repr__(self):
-        wrapped_key = super().__getattribute__('wrapped_key')
-        wrapped = super().__getattribute__(wrapped_key)
-        return '{}({})'.format(self.interval_key, repr(wrapped))
+        return '{}({})'.format(self.interval_key, repr(self.wrapped))
 
     def __hash__(self):
-        return hash(repr(self))
+        # Only hash what `__eq__` compares, so that intervals of copied fields, e.g. in a blended dataset, still have
+        # equal hashes
+        return hash((DatetimeInterval, self.alias))
 
 
 hour, day, week, month, quarter, year = [partial(DatetimeInterval, interval_key=key)
@@ -1,3 +1,5 @@
+import copy
+
 from pypika.terms import Term
 from pypika.utils import format_alias_sql
 
@@ -8,55 +10,89 @@ from fireant.utils import (
 
 
 class Modifier:
-    wrapped_key = "wrapped"
+    # The wrapped object and the cached repr/hash are stored in slots, so reading them never falls through to
+    # `__getattr__`. Subclasses that do not declare `__slots__` themselves still get a `__dict__` for their own
+    # attributes.
+    __slots__ = ("wrapped", "_hash", "_repr")
 
     def __init__(self, wrapped):
-        wrapped_key = super().__getattribute__("wrapped_key")
-        setattr(self, wrapped_key, wrapped)
+        self.wrapped = wrapped
 
     def __getattr__(self, attr):
-        if attr in ("__copy__", "__deepcopy__"):
-            raise AttributeError()
-
-        if attr in self.__dict__:
-            return super().__getattribute__(attr)
+        # Only called for attributes that are not found on the modifier itself. Unset slots and special methods are
+        # never delegated to the wrapped object.
+        if attr in Modifier.__slots__ or (attr.startswith("__") and attr.endswith("__")):
+            raise AttributeError(attr)
 
-        wrapped_key = super().__getattribute__("wrapped_key")
-        wrapped = super().__getattribute__(wrapped_key)
-        return getattr(wrapped, attr)
+        return getattr(self.wrapped, attr)
 
     def __setattr__(self, attr, value):
-        wrapped_key = super().__getattribute__("wrapped_key")
-        if attr == wrapped_key:
-            super().__setattr__(attr, value)
+        if attr in Modifier.__slots__:
+            if attr == "wrapped":
+                self._clear_repr_cache()
+            object.__setattr__(self, attr, value)
             return
 
-        wrapped = super().__getattribute__(wrapped_key)
+        # Any other assignment can change the representation, so drop the cached repr and hash
+        self._clear_repr_cache()
 
-        if attr in wrapped.__dict__:
+        wrapped = self.wrapped
+        if attr in getattr(wrapped, "__dict__", ()):
             setattr(wrapped, attr, value)
             return
 
-        super().__setattr__(attr, value)
+        object.__setattr__(self, attr, value)
+
+    def _clear_repr_cache(self):
+        for cache_attr in ("_hash", "_repr"):
+            try:
+                object.__delattr__(self, cache_attr)
+            except AttributeError:
+                pass
 
     def __hash__(self):
-        return hash(repr(self))
+        # Modifiers are only changed through `for_`, which returns a copy, so the hash is computed once per instance.
+        try:
+            return self._hash
+        except AttributeError:
+            try:
+                value = hash((type(self), self.wrapped))
+            except TypeError:
+                # The wrapped object is not hashable, so fall back to its representation
+                value = hash(repr(self))
+            object.__setattr__(self, "_hash", value)
+            return value
 
     def __repr__(self):
-        wrapped_key = super().__getattribute__("wrapped_key")
-        wrapped = super().__getattribute__(wrapped_key)
-        return "{}({})".format(self.__class__.__name__, repr(wrapped))
+        try:
+            return self._repr
+        except AttributeError:
+            object.__setattr__(self, "_repr", "{}({})".format(self.__class__.__name__, repr(self.wrapped)))
+            return self._repr
 
     def __deepcopy__(self, memodict={}):
-        wrapped_key = super().__getattribute__("wrapped_key")
-        wrapped = super().__getattribute__(wrapped_key)
-        memodict[id(wrapped)] = wrapped
-        return deepcopy(self, memodict)
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memodict[id(self)] = result
+
+        # The wrapped object is shared with the copy. The cached repr and hash are not copied, since the copy is
+        # about to be modified, e.g. by `for_`.
+        object.__setattr__(result, "wrapped", self.wrapped)
+
+        try:
+            instance_dict = object.__getattribute__(self, "__dict__")
+        except AttributeError:
+            instance_dict = {}
+
+        memodict[id(self.wrapped)] = self.wrapped
+        for key, value in instance_dict.items():
+            result.__dict__[key] = copy.deepcopy(value, memodict)
+
+        return result
 
     @immutable
     def for_(self, wrapped):
-        wrapped_key = super().__getattribute__("wrapped_key")
-        setattr(self, wrapped_key, wrapped)
+        self.wrapped = wrapped
 
 
 class FieldModifier:
@@ -76,14 +112,30 @@ class DimensionModifier(Modifier):
     """
     Base class for all dimension modifiers.
     """
-    wrapped_key = "dimension"
+    __slots__ = ()
+
+    @property
+    def dimension(self):
+        return self.wrapped
+
+    @dimension.setter
+    def dimension(self, dimension):
+        self.wrapped = dimension
 
 
 class FilterModifier(Modifier):
     """
     Base class for all filter modifiers.
     """
-    wrapped_key = "filter"
+    __slots__ = ()
+
+    @property
+    def filter(self):
+        return self.wrapped
+
+    @filter.setter
+    def filter(self, filter):
+        self.wrapped = filter
 
     @immutable
     def for_(self, field):
@@ -102,6 +154,7 @@ class Rollup(DimensionModifier):
     """
     A field modifier that will make totals be calculated for the wrapped dimension.
     """
+    __slots__ = ()
 
     @property
     def definition(self):
@@ -113,7 +166,7 @@ class OmitFromRollup(FilterModifier):
     A filter modifier that will make the wrapped filter not apply for any total calculations, which might be
     available if an affected field has a `Rollup` dimension modifier set.
     """
-    pass
+    __slots__ = ()
 
 
 class ResultSet(FilterModifier):
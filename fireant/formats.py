@@ -12,6 +12,7 @@ from fireant.dataset.totals import TOTALS_MARKERS
 from fireant.utils import filter_kwargs
 
 RAW_VALUE = "raw"
+DISPLAY_VALUE = "display"
 INF_VALUE = "Inf"
 NAN_VALUE = "NaN"
 NULL_VALUE = "null"
@@ -46,6 +47,29 @@ def date_as_string(value, interval_key=None):
     return value.strftime(f)
 
 
+def date_index_as_string(values, interval_key=None):
+    """
+    Formats all of the dates in a `pd.DatetimeIndex` at once, the same way `date_as_string` formats a single date.
+
+    :param values:
+        A `pd.DatetimeIndex`.
+    :param interval_key:
+        The interval key used to select the date format.
+    :return:
+        A list of formatted dates, with None in place of missing dates.
+    """
+    if interval_key == 'quarter':
+        # strftime does not support a quarter format placeholder for dates, but it does for periods
+        formatted = values.to_period('Q').strftime('Q%q %Y')
+    else:
+        formatted = values.strftime(DATE_FORMATS.get(interval_key, "%Y-%m-%d"))
+
+    return [
+        None if is_missing else value
+        for value, is_missing in zip(formatted, values.isna())
+    ]
+
+
 @filter_kwargs
 def date_as_millis(value):
     if isinstance(value, date) and not isinstance(value, datetime):
@@ -202,15 +226,25 @@ def display_value(
     :return:
         A formatted string containing the display value for the metric.
     """
-    if value is None:
-        return null_value
-    if pd.isnull(value):
-        return nan_value
-    if isinstance(value, float) and np.isinf(value):
-        return INF_VALUE
-    if value in TOTALS_MARKERS:
-        return TOTALS_LABEL
+    formatter = display_value_formatter(
+        field, date_as=date_as, nan_value=nan_value, null_value=null_value, use_raw_value=use_raw_value,
+    )
+    return formatter(value)
+
+
+def display_value_formatter(
+    field, date_as=date_as_string, nan_value=NAN_VALUE, null_value=NULL_VALUE, use_raw_value=False,
+):
+    """
+    Creates a function that converts metric values of a field into display values, the same way as `display_value`.
+    The formatting options of the field are only looked up once, so this should be used when formatting many values
+    of the same field.
+
+    See `display_value` for the parameters.
 
+    :return:
+        A function that takes a raw metric value and returns a formatted string containing the display value.
+    """
     format_kwargs = {
         key: getattr(field, key, None)
         for key in ("prefix", "suffix", "thousands", "precision", "interval_key")
@@ -219,5 +253,18 @@ def display_value(
         key: value for key, value in format_kwargs.items() if value is not None
     }
 
-    formatter = FIELD_DISPLAY_FORMATTER.get(field.data_type, _identity)
-    return formatter(value, date_as=date_as, use_raw_value=use_raw_value, **format_kwargs)
+    formatter = FIELD_DISPLAY_FORMATTER.get(getattr(field, "data_type", None), _identity)
+
+    def _display_value(value):
+        if value is None:
+            return null_value
+        if pd.isnull(value):
+            return nan_value
+        if isinstance(value, float) and np.isinf(value):
+            return INF_VALUE
+        if value in TOTALS_MARKERS:
+            return TOTALS_LABEL
+
+        return formatter(value, date_as=date_as, use_raw_value=use_raw_value, **format_kwargs)
+
+    return _display_value
@@ -105,17 +105,22 @@ def reduce_result_set(
 
 
 def _replace_rollup_constants_for_totals_markers(data_frame, dtypes):
-    # some things are just easier to do without an index. Reset it temporarily to replace Rollup constants with the
-    # rollup marker values
-    index_names = data_frame.index.names
-    data_frame.reset_index(inplace=True)
-
-    for dimension_key, dtype in dtypes.items():
-        data_frame[dimension_key] = data_frame[dimension_key].replace(
-            RollupValue.CONSTANT, get_totals_marker_for_dtype(dtype)
-        )
-
-    return data_frame.set_index(index_names)
+    # Replace the Rollup constants with the rollup marker values one index level at a time. This avoids moving the
+    # index into columns and back, which copies the whole data frame twice.
+    index = data_frame.index
+    level_values = []
+    for level, dimension_key in enumerate(index.names):
+        values = pd.Series(index.get_level_values(level))
+        if dimension_key in dtypes:
+            values = values.replace(RollupValue.CONSTANT, get_totals_marker_for_dtype(dtypes[dimension_key]))
+        level_values.append(values)
+
+    data_frame.index = (
+        pd.MultiIndex.from_arrays(level_values, names=index.names)
+        if isinstance(index, pd.MultiIndex)
+        else pd.Index(level_values[0], name=index.name)
+    )
+    return data_frame
 
 
 def _make_reference_data_frame(base_df, ref_df, reference):
@@ -126,7 +126,9 @@ def _group_paginate(data_frame, start=None, end=None, orders=()):
         sorted_dimension_values = tuple(sorted_df.index)[start:end]
 
     else:
-        sorted_dimension_values = tuple(dimension_groups.apply(lambda g: g.name))[start:end]
+        # The index of the group sizes holds the sorted group keys. Computing it is a single hash based aggregation,
+        # instead of calling a python function for every group.
+        sorted_dimension_values = tuple(dimension_groups.size().index)[start:end]
 
     sorted_dimension_values = (
         pd.Index(sorted_dimension_values, name=dimension_levels[0])
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+from fireant import Rollup
+from fireant.dataset.intervals import day
+from fireant.tests.dataset.mocks import mock_dataset, mock_dataset_blender
+
+
+class ModifierHashTests(TestCase):
+    def test_hash_is_based_on_type_and_wrapped_field(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+
+        self.assertEqual(hash((Rollup, mock_dataset.fields.political_party)), hash(rollup))
+
+    def test_hash_falls_back_to_repr_when_wrapped_is_not_hashable(self):
+        rollup = Rollup(["not", "hashable"])
+
+        self.assertEqual(hash("Rollup(['not', 'hashable'])"), hash(rollup))
+
+    def test_hash_is_stable_across_calls(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+
+        self.assertEqual(hash(rollup), hash(rollup))
+
+    def test_for_does_not_reuse_cached_hash(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+        hash(rollup)
+
+        replaced = rollup.for_(mock_dataset.fields["candidate-name"])
+
+        expected_repr = "Rollup({!r})".format(mock_dataset.fields["candidate-name"])
+        self.assertEqual(expected_repr, repr(replaced))
+        self.assertEqual(hash((Rollup, mock_dataset.fields["candidate-name"])), hash(replaced))
+        self.assertEqual("Rollup({!r})".format(mock_dataset.fields.political_party), repr(rollup))
+
+
+class IntervalHashTests(TestCase):
+    def test_equal_intervals_of_copied_fields_have_equal_hashes(self):
+        interval = day(mock_dataset.fields.timestamp)
+        blended_interval = day(mock_dataset_blender.fields.timestamp)
+
+        self.assertIsNot(mock_dataset.fields.timestamp, mock_dataset_blender.fields.timestamp)
+        self.assertEqual(interval, blended_interval)
+        self.assertEqual(hash(interval), hash(blended_interval))
+        self.assertIn(blended_interval, {interval})
+        self.assertEqual(1, {interval: 1}.get(blended_interval))
+
+
+class ModifierAttributeTests(TestCase):
+    def test_attributes_are_read_from_the_wrapped_field(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+
+        self.assertEqual("political_party", rollup.alias)
+        self.assertEqual(mock_dataset.fields.political_party.data_type, rollup.data_type)
+
+    def test_dimension_is_the_wrapped_field(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+
+        self.assertIs(mock_dataset.fields.political_party, rollup.dimension)
+        self.assertIs(rollup.wrapped, rollup.dimension)
+
+    def test_setting_dimension_replaces_the_wrapped_field(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+        hash(rollup)
+
+        rollup.dimension = mock_dataset.fields["candidate-name"]
+
+        self.assertIs(mock_dataset.fields["candidate-name"], rollup.wrapped)
+        self.assertEqual(hash((Rollup, mock_dataset.fields["candidate-name"])), hash(rollup))
+
+    def test_missing_attribute_raises_attribute_error(self):
+        rollup = Rollup(mock_dataset.fields.political_party)
+
+        with self.assertRaises(AttributeError):
+            rollup.does_not_exist
@@ -5,6 +5,7 @@ from datetime import (
 from unittest import TestCase
 
 import numpy as np
+import pandas as pd
 
 from fireant import (
     DataType,
@@ -213,6 +214,42 @@ class FormatDisplayValueTests(TestCase):
                 self.assertEqual("2019", formats.display_value(d, year(date_field)))
 
 
+class DisplayValueFormatterTests(TestCase):
+    def test_formats_values_like_display_value(self):
+        field = Field("number", None, data_type=DataType.number, prefix="$", thousands=",", precision=2)
+        formatter = formats.display_value_formatter(field)
+
+        for value in (None, np.nan, np.inf, NUMBER_TOTALS, 1, 1234.5678, -0.5):
+            with self.subTest(value):
+                self.assertEqual(formats.display_value(value, field), formatter(value))
+
+    def test_formats_with_nan_and_null_values_args(self):
+        formatter = formats.display_value_formatter(number_field, nan_value="", null_value="-")
+
+        self.assertEqual("", formatter(np.nan))
+        self.assertEqual("-", formatter(None))
+
+
+class DateIndexAsStringTests(TestCase):
+    def test_dates_are_formatted_like_date_as_string(self):
+        dates = pd.DatetimeIndex([datetime(2019, 1, 1, 12, 30, 2), datetime(2019, 2, 25)])
+
+        for interval_key in ("iso", "hour", "day", "week", "month", "year", "quarter", None):
+            with self.subTest(interval_key):
+                self.assertEqual(
+                    [formats.date_as_string(d, interval_key=interval_key) for d in dates],
+                    formats.date_index_as_string(dates, interval_key=interval_key),
+                )
+
+    def test_missing_dates_are_returned_as_none(self):
+        dates = pd.DatetimeIndex([datetime(2019, 1, 1), None])
+
+        for interval_key in ("day", "quarter"):
+            with self.subTest(interval_key):
+                result = formats.date_index_as_string(dates, interval_key=interval_key)
+                self.assertIsNone(result[1])
+
+
 class FormatDisplayValueStyleTests(TestCase):
     def test_style_numbers_with_prefix(self):
         dollar_field = Field("number", None, data_type=DataType.number, prefix="$")
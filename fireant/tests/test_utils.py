@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from fireant.utils import write_named_temp_csv, read_csv
+from fireant.utils import filter_kwargs, write_named_temp_csv, read_csv
 
 
 class TestFileOperations(TestCase):
@@ -13,3 +13,19 @@ class TestFileOperations(TestCase):
         self.assertEqual(["a", "1", "True", "", "1.8"], rows[0])
         self.assertEqual(["", "-1", "False"], rows[1])
         self.assertEqual([], rows[2])
+
+
+class TestFilterKwargs(TestCase):
+    def test_kwargs_not_accepted_by_the_function_are_removed(self):
+        @filter_kwargs
+        def f(value, a=None):
+            return value, a
+
+        self.assertEqual((1, 2), f(1, a=2, b=3))
+
+    def test_all_kwargs_are_passed_if_the_function_accepts_any(self):
+        @filter_kwargs
+        def f(value, **kwargs):
+            return value, kwargs
+
+        self.assertEqual((1, {"a": 2, "b": 3}), f(1, a=2, b=3))
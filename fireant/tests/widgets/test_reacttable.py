@@ -1,4 +1,6 @@
+import json
 from unittest import TestCase
+from unittest.mock import patch
 
 import pandas as pd
 from pypika import Table
@@ -12,6 +14,7 @@ from fireant import (
     day,
 )
 from fireant.dataset.filters import ComparisonOperator
+from fireant.dataset.totals import TEXT_TOTALS
 from fireant.tests.database.mock_database import TestDatabase
 from fireant.tests.dataset.mocks import (
     CumSum,
@@ -28,8 +31,10 @@ from fireant.tests.dataset.mocks import (
     dimx2_date_str_totals_df,
     dimx2_date_str_totalsx2_df,
     dimx2_str_str_df,
+    dimx3_date_str_str_df,
     mock_dataset,
 )
+from fireant.widgets import reacttable
 from fireant.widgets.base import ReferenceItem
 from fireant.widgets.reacttable import (
     FormattingConditionRule,
@@ -441,6 +446,98 @@ class ReactTableTransformerTests(TestCase):
             result,
         )
 
+    def test_transform_does_not_modify_the_data_frame(self):
+        df = dimx2_date_str_df.copy()
+        ReactTable(mock_dataset.fields.votes, pivot=[mock_dataset.fields.political_party]).transform(
+            df, [day(mock_dataset.fields.timestamp), mock_dataset.fields.political_party], []
+        )
+
+        pd.testing.assert_frame_equal(dimx2_date_str_df, df)
+        self.assertIsNone(df.columns.name)
+
+    def test_empty_data_frame(self):
+        result = ReactTable(mock_dataset.fields.votes).transform(
+            dimx2_date_str_df.iloc[:0], [day(mock_dataset.fields.timestamp), mock_dataset.fields.political_party], []
+        )
+
+        self.assertEqual(
+            {
+                "columns": [
+                    {"Header": "Timestamp", "accessor": "$timestamp"},
+                    {"Header": "Party", "accessor": "$political_party"},
+                    {"Header": "Votes", "accessor": "$votes"},
+                ],
+                "data": [],
+            },
+            result,
+        )
+
+    def _data_as_json_cases(self):
+        political_party = mock_dataset.fields.political_party
+        return [
+            (
+                dict(),
+                dimx2_date_str_df,
+                [day(mock_dataset.fields.timestamp), political_party],
+            ),
+            (dict(transpose=True), dimx0_metricx2_df, []),
+            (dict(pivot=[political_party]), dimx1_str_df, [political_party]),
+            # Non-ASCII text is written as UTF-8 by both the orjson and the json module branch
+            (dict(), dimx1_str_df.rename(index={"Democrat": "Zürich"}), [political_party]),
+        ]
+
+    def _assert_data_as_json_cases(self):
+        votes, wins = mock_dataset.fields.votes, mock_dataset.fields.wins
+        for kwargs, data_frame, dimensions in self._data_as_json_cases():
+            with self.subTest(kwargs=kwargs, dimensions=dimensions):
+                expected = ReactTable(votes, wins, **kwargs).transform(data_frame, dimensions, [])
+                result = ReactTable(votes, wins, data_as_json=True, **kwargs).transform(data_frame, dimensions, [])
+
+                self.assertEqual(expected["columns"], result["columns"])
+                self.assertNotIn("data", result)
+                # Non-string keys become strings in JSON, so compare with the data after a round trip through JSON
+                self.assertEqual(json.loads(json.dumps(expected["data"])), json.loads(result["data_json"]))
+
+    def test_data_as_json_with_json_module(self):
+        with patch("fireant.widgets.reacttable.orjson", None):
+            self._assert_data_as_json_cases()
+
+    def test_data_as_json_with_orjson(self):
+        if reacttable.orjson is None:
+            self.skipTest("orjson is not installed")
+
+        self._assert_data_as_json_cases()
+
+    def test_data_as_json_with_orjson_and_json_module_give_the_same_bytes(self):
+        if reacttable.orjson is None:
+            self.skipTest("orjson is not installed")
+
+        widget_args = (mock_dataset.fields.votes, mock_dataset.fields.wins)
+        for kwargs, data_frame, dimensions in self._data_as_json_cases():
+            with self.subTest(kwargs=kwargs, dimensions=dimensions):
+                widget = ReactTable(*widget_args, data_as_json=True, **kwargs)
+                orjson_result = widget.transform(data_frame, dimensions, [])
+                with patch("fireant.widgets.reacttable.orjson", None):
+                    json_result = widget.transform(data_frame, dimensions, [])
+
+                self.assertEqual(json_result["data_json"], orjson_result["data_json"])
+
+    @patch("fireant.queries.builder.dataset_query_builder.fetch_data")
+    def test_data_as_json_through_fetch(self, mock_fetch_data):
+        mock_fetch_data.return_value = (100, dimx2_date_str_df)
+        dimensions = [day(mock_dataset.fields.timestamp), mock_dataset.fields.political_party]
+
+        expected, result = (
+            mock_dataset.query.widget(ReactTable(mock_dataset.fields.votes))
+            .widget(ReactTable(mock_dataset.fields.votes, data_as_json=True))
+            .dimension(*dimensions)
+            .fetch()
+        )
+
+        self.assertEqual(expected["columns"], result["columns"])
+        self.assertNotIn("data", result)
+        self.assertEqual(json.loads(json.dumps(expected["data"])), json.loads(result["data_json"]))
+
     def test_multiple_metrics_reversed(self):
         result = ReactTable(
             mock_dataset.fields.wins, mock_dataset.fields.votes
@@ -900,6 +997,21 @@ class ReactTableTransformerTests(TestCase):
             result,
         )
 
+    def test_raw_values_keep_the_type_of_their_column(self):
+        # Each column is read on its own, so an int column is not upcast to float by the float column next to it
+        dimensions = [
+            day(mock_dataset.fields.timestamp),
+            mock_dataset.fields.political_party,
+        ]
+        references = [ElectionOverElection(mock_dataset.fields.timestamp)]
+        result = ReactTable(mock_dataset.fields.votes).transform(
+            dimx2_date_str_ref_df, dimensions, references
+        )
+
+        row = result["data"][0]
+        self.assertIs(int, type(row["$votes"]["raw"]))
+        self.assertIs(float, type(row["$votes_eoe"]["raw"]))
+
     def test_dimx1_date_metricsx2_references(self):
         dimensions = [
             day(mock_dataset.fields.timestamp),
@@ -1005,6 +1117,32 @@ class ReactTableTransformerTests(TestCase):
             result,
         )
 
+    def test_hide_dimension_in_transposed_table_is_not_supported(self):
+        dimensions = [
+            day(mock_dataset.fields.timestamp),
+            mock_dataset.fields.political_party,
+            mock_dataset.fields.state,
+        ]
+
+        for pivot in ([], [mock_dataset.fields.political_party]):
+            with self.subTest(pivot=pivot):
+                widget = ReactTable(
+                    mock_dataset.fields.votes, hide=[mock_dataset.fields.state], pivot=pivot, transpose=True
+                )
+
+                with self.assertRaises(KeyError):
+                    widget.transform(dimx3_date_str_str_df, dimensions, [])
+
+    def test_hide_dimension_that_is_not_in_the_query_is_not_supported(self):
+        dimensions = [
+            day(mock_dataset.fields.timestamp),
+            mock_dataset.fields.political_party,
+        ]
+        widget = ReactTable(mock_dataset.fields.votes, hide=[mock_dataset.fields.state])
+
+        with self.assertRaises(KeyError):
+            widget.transform(dimx2_date_str_df, dimensions, [])
+
     def test_dimx2_hide_dim1(self):
         dimensions = [
             day(mock_dataset.fields.timestamp),
@@ -1706,6 +1844,94 @@ class ReactTableTransformerTests(TestCase):
             result,
         )
 
+    def test_pivot_rollup_bool_level_that_is_not_the_last_level(self):
+        # The winner level holds booleans and the totals marker, which cannot be sorted together
+        winner = Rollup(mock_dataset.fields.winner)
+        political_party = mock_dataset.fields.political_party
+        timestamp = pd.Timestamp("2000-01-01")
+        df = pd.DataFrame(
+            {"$votes": [4, 2, 6, 1]},
+            index=pd.MultiIndex.from_tuples(
+                [
+                    (timestamp, False, "Democrat"),
+                    (timestamp, True, "Republican"),
+                    (timestamp, TEXT_TOTALS, "Democrat"),
+                    (timestamp, TEXT_TOTALS, "Republican"),
+                ],
+                names=["$timestamp", "$winner", "$political_party"],
+            ),
+        )
+
+        result = ReactTable(mock_dataset.fields.votes, pivot=[winner, political_party]).transform(
+            df, [day(mock_dataset.fields.timestamp), winner, political_party], []
+        )
+
+        self.assertEqual(
+            [
+                {"Header": "Timestamp", "accessor": "$timestamp"},
+                {
+                    "Header": "false",
+                    "columns": [{"Header": "Democrat", "accessor": "$votes.False.Democrat"}],
+                },
+                {
+                    "Header": "true",
+                    "columns": [{"Header": "Republican", "accessor": "$votes.True.Republican"}],
+                },
+                {
+                    "Header": "Totals",
+                    "className": "fireant-totals",
+                    "columns": [
+                        {"Header": "Democrat", "accessor": "$votes.$totals.Democrat"},
+                        {"Header": "Republican", "accessor": "$votes.$totals.Republican"},
+                    ],
+                },
+            ],
+            result["columns"],
+        )
+        self.assertEqual(
+            {
+                "$totals": {
+                    "Democrat": {"display": "6", "raw": 6},
+                    "Republican": {"display": "1", "raw": 1},
+                },
+                "False": {"Democrat": {"display": "4", "raw": 4}},
+                "True": {"Republican": {"display": "2", "raw": 2}},
+            },
+            result["data"][0]["$votes"],
+        )
+
+    def test_pivot_mixed_type_level_keeps_the_level_order(self):
+        # The ints and strings of the first level cannot be sorted together, so the order of the level is used
+        columns = pd.MultiIndex.from_tuples(
+            [("b", "Democrat"), (1, "Republican"), ("b", "Republican")],
+            names=["$candidate-id", "$political_party"],
+        )
+        df = pd.DataFrame([[1, 2, 3]], columns=columns)
+        df.name = "$votes"
+        field_map = {
+            "$candidate-id": mock_dataset.fields["candidate-id"],
+            "$political_party": mock_dataset.fields.political_party,
+        }
+
+        result = ReactTable.transform_data_column_headers(df, field_map)
+
+        self.assertEqual(
+            [
+                {
+                    "Header": "1",
+                    "columns": [{"Header": "Republican", "accessor": "$votes.1.Republican"}],
+                },
+                {
+                    "Header": "b",
+                    "columns": [
+                        {"Header": "Democrat", "accessor": "$votes.b.Democrat"},
+                        {"Header": "Republican", "accessor": "$votes.b.Republican"},
+                    ],
+                },
+            ],
+            result,
+        )
+
     def test_dimx2_date_str_pivot_dim2_rollup_all(self):
         political_party = Rollup(mock_dataset.fields.political_party)
         dimensions = [Rollup(day(mock_dataset.fields.timestamp)), political_party]
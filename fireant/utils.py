@@ -3,7 +3,7 @@ import csv
 import inspect
 import tempfile
 from collections import OrderedDict
-from functools import partial, wraps
+from functools import wraps
 from types import GeneratorType
 
 
@@ -151,27 +151,50 @@ def getdeepattr(d, keys, default_value=None):
     return d_level
 
 
-def apply_kwargs(f, *args, **kwargs):
+def _accepted_kwargs(f):
+    """
+    :return:
+        A set with the names of the keyword arguments accepted by `f` or None if `f` accepts any keyword argument.
+    """
     argspec = inspect.getfullargspec(f)
-    allowed = set(argspec.args[-len(argspec.defaults or ()) :])
+    if argspec.varkw:
+        return None
+
+    return set(argspec.args[-len(argspec.defaults or ()) :])
+
+
+def _call_with_accepted_kwargs(f, accepted, args, kwargs):
     return f(
         *args,
         **{
             key: kwarg
             for key, kwarg in kwargs.items()
-            if argspec.varkw or key in allowed
+            if accepted is None or key in accepted
         }
     )
 
 
+def apply_kwargs(f, *args, **kwargs):
+    return _call_with_accepted_kwargs(f, _accepted_kwargs(f), args, kwargs)
+
+
 def filter_kwargs(f):
     """
     Removes any kwargs from function call that are not accepted by the called function.
 
+    The accepted kwargs are looked up once when decorating, since inspecting the signature of `f` is far slower than
+    calling it.
+
     :param f:
     :return:
     """
-    return partial(apply_kwargs, f)
+    accepted = _accepted_kwargs(f)
+
+    @wraps(f)
+    def _filter_kwargs(*args, **kwargs):
+        return _call_with_accepted_kwargs(f, accepted, args, kwargs)
+
+    return _filter_kwargs
 
 
 def flatten(items):
@@ -98,10 +98,11 @@ class TransformableWidget(Widget):
 
 
 class ReferenceItem:
-    def __init__(self, item, reference):
+    def __init__(self, item, reference, alias=None):
         assert isinstance(reference, Reference)
         self.data_type = item.data_type
-        self.alias = reference_alias(item, reference)
+        # The alias can be passed in by callers that already computed it
+        self.alias = reference_alias(item, reference) if alias is None else alias
         self.label = reference_label(item, reference)
         self.prefix = reference_prefix(item, reference)
         self.suffix = reference_suffix(item, reference)
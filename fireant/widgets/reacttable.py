@@ -1,7 +1,9 @@
 import colorsys
+import json
 import re
 from collections import OrderedDict, defaultdict
 from functools import partial
+from itertools import repeat
 
 import pandas as pd
 import numpy as np
@@ -18,9 +20,12 @@ from fireant.dataset.totals import (
     TOTALS_MARKERS,
 )
 from fireant.formats import (
+    DISPLAY_VALUE,
     RAW_VALUE,
     TOTALS_VALUE,
+    date_index_as_string,
     display_value,
+    display_value_formatter,
     json_value,
     raw_value,
     return_none,
@@ -30,17 +35,21 @@ from fireant.reference_helpers import reference_alias
 from fireant.utils import (
     alias_for_alias_selector,
     alias_selector,
-    getdeepattr,
-    setdeepattr,
     wrap_list,
 )
 from .base import ReferenceItem
 from .pandas import Pandas
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 TOTALS_LABEL = "Totals"
 METRICS_DIMENSION_ALIAS = "metrics"
 F_METRICS_DIMENSION_ALIAS = alias_selector(METRICS_DIMENSION_ALIAS)
 _display_value = partial(display_value, nan_value="", null_value="")
+_display_value_formatter = partial(display_value_formatter, nan_value="", null_value="")
 
 
 def hex_to_rgb(hex_val):
@@ -189,18 +198,36 @@ def find_rule_to_apply(rules, value):
     return None
 
 
-def map_index_level(index, level, func):
-    # If the index is empty, do not do anything
-    if 0 == index.size:
-        return index
+def get_level_sort_keys(level):
+    """
+    Returns the rank of each value of a column index level in sorted order. The extra -1 at the end is the key used for
+    null values, which have the code -1.
+    """
+    try:
+        ranks = np.argsort(level.argsort()).tolist()
+    except TypeError:
+        # Values of mixed types, e.g. booleans and the totals marker of a rolled up dimension, cannot be compared, so
+        # keep them in the order of the level
+        ranks = list(range(len(level)))
+
+    return ranks + [-1]
 
-    if isinstance(index, pd.MultiIndex):
-        values = index.levels[level]
-        return index.set_levels(values.map(func), level)
 
-    assert level == 0
+def dump_json(data):
+    """
+    Serializes the transformed data to JSON. orjson is used when it is installed, since it is a lot faster than the
+    standard library for the many small dicts in the rows.
+
+    :param data:
+        The transformed rows.
+    :return:
+        The rows encoded as UTF-8 JSON.
+    """
+    if orjson is not None:
+        # Transposed tables without dimensions have rows with integer keys, which the json module also accepts
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
 
-    return index.map(func)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 class TotalsItem:
@@ -249,6 +276,7 @@ class ReactTable(Pandas):
         ascending=None,
         max_columns=None,
         formatting_rules=(),
+        data_as_json=False,
     ):
         super(ReactTable, self).__init__(
             metric,
@@ -260,6 +288,9 @@ class ReactTable(Pandas):
             ascending=ascending,
             max_columns=max_columns
         )
+        # Return the data already serialized to JSON as `data_json` instead of `data`, so it does not have to be
+        # serialized again when it is sent to the front-end.
+        self.data_as_json = data_as_json
         self.formatting_rules_map = defaultdict(list)
         self.min_max_map = {}
         for formatting_rule in formatting_rules:
@@ -339,8 +370,9 @@ class ReactTable(Pandas):
         :param dimensions:
         :return:
         """
-        data_frame = data_frame.copy()
-        data_frame.columns.name = F_METRICS_DIMENSION_ALIAS
+        # Only the columns are replaced, so a shallow copy is enough to leave the original data frame untouched
+        data_frame = data_frame.copy(deep=False)
+        data_frame.columns = data_frame.columns.set_names(F_METRICS_DIMENSION_ALIAS)
         return data_frame
 
     @staticmethod
@@ -437,76 +469,171 @@ class ReactTable(Pandas):
 
             return safe_value(column_value)
 
-        def _make_columns(columns_frame, previous_level_values=()):
-            """
-            This function recursively creates the individual column definitions for React Table with the above tree
-            structure depending on how many index levels there are in the columns.
-
-            :param columns_frame:
-                A data frame representing the columns of the result set data frame.
-            :param previous_level_values:
-                A tuple containing the higher level index level values used for building the data accessor path
-            """
-            f_dimension_alias = columns_frame.index.names[0]
-
-            # Group the columns if they are multi-index so we can get the proper sub-column values. This will yield
-            # one group per dimension value with the group data frame containing only the relevant sub-columns
-            groups = (
-                columns_frame.groupby(level=0)
-                if isinstance(columns_frame.index, pd.MultiIndex)
-                else [(level, None) for level in columns_frame.index]
-            )
-
-            columns = []
-            for column_value, group in groups:
-                is_totals = column_value in TOTALS_MARKERS | {TOTALS_LABEL}
-
-                # All column definitions have a header
-                column = {
-                    "Header": get_header(column_value, f_dimension_alias, is_totals)
-                }
+        totals_values = TOTALS_MARKERS | {TOTALS_LABEL}
 
-                level_values = previous_level_values + (column_value,)
-                if group is not None:
-                    # If there is a group, then drop this index level from the group data frame and recurse to build
-                    # sub column definitions
-                    next_level_df = group.reset_index(level=0, drop=True)
-                    column["columns"] = _make_columns(next_level_df, level_values)
+        def _make_column(column_value, f_dimension_alias, level_values, is_leaf):
+            is_totals = column_value in totals_values
 
-                else:
-                    column["accessor"] = ".".join(
-                        safe_value(value) for value in level_values
-                    )
+            # All column definitions have a header
+            column = {
+                "Header": get_header(column_value, f_dimension_alias, is_totals)
+            }
 
-                if is_totals:
-                    column["className"] = "fireant-totals"
+            if is_leaf:
+                column["accessor"] = ".".join(
+                    safe_value(value) for value in level_values
+                )
+            else:
+                column["columns"] = []
 
-                columns.append(column)
+            if is_totals:
+                column["className"] = "fireant-totals"
 
-            return columns
+            return column
 
         # If the query only has a single metric, that level will be dropped, and set as data_frame.name
         dropped_metric_level_name = (
             (data_frame.name,) if hasattr(data_frame, "name") else ()
         )
 
-        return _make_columns(data_frame.columns.to_frame(), dropped_metric_level_name)
+        columns = data_frame.columns
+        if not isinstance(columns, pd.MultiIndex):
+            return [
+                _make_column(value, columns.name, dropped_metric_level_name + (value,), is_leaf=True)
+                for value in columns.tolist()
+            ]
+
+        # The column definitions are built in a single pass over the columns, using the level codes to find the group
+        # of each column on every level except the last one. Groups are sorted by their value, the same way as
+        # grouping by an index level sorts them. Columns with a null value in one of these levels are left out.
+        f_dimension_aliases = columns.names
+        group_codes = [codes.tolist() for codes in columns.codes[:-1]]
+        group_values = [level.tolist() for level in columns.levels[:-1]]
+        group_sort_keys = [get_level_sort_keys(level) for level in columns.levels[:-1]]
+        leaf_values = columns.get_level_values(-1).tolist()
+
+        column_codes = list(zip(*group_codes))
+        column_sort_keys = [
+            tuple(sort_keys[code] for sort_keys, code in zip(group_sort_keys, codes))
+            for codes in column_codes
+        ]
+        groups = {}
+        root_columns = []
+        for position in sorted(range(len(columns)), key=column_sort_keys.__getitem__):
+            sub_columns = root_columns
+            level_values = dropped_metric_level_name
+            codes = column_codes[position]
+
+            for depth, code in enumerate(codes):
+                if code == -1:
+                    break
+
+                column_value = group_values[depth][code]
+                level_values += (column_value,)
+
+                group_key = codes[:depth + 1]
+                group = groups.get(group_key)
+                if group is None:
+                    group = groups[group_key] = _make_column(
+                        column_value, f_dimension_aliases[depth], level_values, is_leaf=False
+                    )
+                    sub_columns.append(group)
+
+                sub_columns = group["columns"]
+
+            else:
+                leaf_value = leaf_values[position]
+                sub_columns.append(
+                    _make_column(leaf_value, f_dimension_aliases[-1], level_values + (leaf_value,), is_leaf=True)
+                )
+
+        return root_columns
 
     @staticmethod
-    def transform_row_index(index_values, field_map, dimension_hyperlink_templates, hide_dimension_aliases, row_colors):
+    def format_date_index_levels(index, field_map):
+        """
+        Formats the raw and display values of the date levels in the index for all rows at once, instead of formatting
+        each date separately while building the rows.
+
+        :param index:
+            The index of the result set data frame.
+        :param field_map:
+            A mapping to all the fields in the dataset used for this query.
+        :return:
+            A dict with the alias of each date level as the key and a list with a (raw, display) tuple for each row as
+            the value.
+        """
+        formatted_levels = {}
+        for level, f_dimension_alias in enumerate(index.names):
+            field = field_map.get(f_dimension_alias)
+            values = index.get_level_values(level)
+            if field is None or field.data_type != DataType.date or not pd.api.types.is_datetime64_any_dtype(values):
+                continue
+
+            raw_values = date_index_as_string(values, interval_key="iso")
+            display_values = date_index_as_string(values, interval_key=getattr(field, "interval_key", None))
+            formatted_levels[f_dimension_alias] = [
+                (TOTALS_VALUE, TOTALS_LABEL)
+                if is_totals
+                else (raw, "" if display is None else display)
+                for raw, display, is_totals in zip(raw_values, display_values, values == DATE_TOTALS)
+            ]
+
+        return formatted_levels
+
+    @staticmethod
+    def map_index_level_fields(index_names, field_map, dimension_hyperlink_templates, hide_dimension_aliases):
+        """
+        Looks up everything needed to transform the index levels of the rows, so it only has to be done once and not
+        for every row.
+
+        :param index_names:
+            The names of the index levels of the result set data frame.
+        :param field_map:
+            A mapping to all the fields in the dataset used for this query.
+        :param dimension_hyperlink_templates:
+            A mapping to fields and its hyperlink dimension, if any.
+        :param hide_dimension_aliases:
+            A set with hide dimension aliases.
+        :return:
+            A list with a tuple (alias, field, display value formatter, row key, hyperlink template) for each index
+            level that is included in the rows.
+        """
+        index_level_fields = []
+        for f_dimension_alias in index_names:
+            if f_dimension_alias is None or f_dimension_alias not in field_map:
+                continue
+
+            if f_dimension_alias in hide_dimension_aliases:
+                continue
+
+            field = field_map[f_dimension_alias]
+            index_level_fields.append(
+                (
+                    f_dimension_alias,
+                    field,
+                    _display_value_formatter(field),
+                    safe_value(f_dimension_alias),
+                    dimension_hyperlink_templates.get(f_dimension_alias),
+                )
+            )
+
+        return index_level_fields
+
+    @staticmethod
+    def transform_row_index(index_values, index_level_fields, row_colors, formatted_index_values=None):
         # Add the index to the row
         row = {}
-        for key, value in index_values.items():
-            if key is None or key not in field_map:
-                continue
+        for key, field, display_formatter, safe_key, hyperlink_template in index_level_fields:
+            value = index_values[key]
 
-            field_alias = key
-            field = field_map[field_alias]
+            # Use the values formatted up front for the whole index, if any
+            if formatted_index_values and key in formatted_index_values:
+                raw, display = formatted_index_values[key]
+            else:
+                raw, display = raw_value(value, field), display_formatter(value)
 
-            data = {RAW_VALUE: raw_value(value, field)}
-            display = _display_value(value, field)
-            if display is not None:
-                data["display"] = display
+            data = {RAW_VALUE: raw} if display is None else {RAW_VALUE: raw, DISPLAY_VALUE: display}
             if row_colors is not None:
                 data["color"], data["text_color"] = row_colors
 
@@ -515,29 +642,21 @@ class ReactTable(Pandas):
             # If the dimension has a hyperlink template, then apply the template by formatting it with the dimension
             # values for this row. The values contained in `index_values` will always contain all of the required values
             # at this point, otherwise the hyperlink template will not be included.
-            if not is_totals and key in dimension_hyperlink_templates:
+            if not is_totals and hyperlink_template is not None:
                 try:
-                    data["hyperlink"] = dimension_hyperlink_templates[key].format(
-                        **index_values
-                    )
+                    data["hyperlink"] = hyperlink_template.format(**index_values)
                 except KeyError:
                     pass
 
-            safe_key = safe_value(key)
             row[safe_key] = data
 
-        for dimension_alias in hide_dimension_aliases:
-            del row[dimension_alias]
-
         return row
 
     @staticmethod
-    def _get_row_value_accessor(series, fields, key):
-        index_names = series.index.names or []
-
+    def _get_column_accessor(column_names, fields, key):
         accessor_fields = [
             fields[field_alias]
-            for field_alias in index_names
+            for field_alias in column_names
             if field_alias is not None
         ]
         accessor = [
@@ -546,19 +665,43 @@ class ReactTable(Pandas):
 
         return accessor
 
-    def transform_row_values(self, series, fields, is_transposed, is_pivoted):
+    def transform_row_values(
+        self, values, metric_aliases, accessors, fields, display_formatters, is_transposed, is_pivoted,
+    ):
+        """
+        Builds the metric cells for a single row.
+
+        :param values:
+            The values of the row, in column order.
+        :param metric_aliases:
+            The metric alias for each of the values.
+        :param accessors:
+            The data accessor path for each of the values, as set in the column headers. Each path is split into a
+            tuple of the parent keys and the key of the value itself.
+        :param fields:
+            A mapping to all the fields in the dataset used for this query.
+        :param display_formatters:
+            A mapping from metric alias to the function that formats the display values of that metric.
+        :param is_transposed:
+            Whether the table is transposed or not.
+        :param is_pivoted:
+            Whether the table is pivoted or not.
+        :return:
+            Tuple(The row dict, the row colors if a rule covering the row applied)
+        """
         row = {}
         row_colors = None
+        cells = []
 
-        for key, value in series.items():
-            key = wrap_list(key)
-
+        for value, metric_alias, (parent_keys, key) in zip(values, metric_aliases, accessors):
             # Get the field for the metric
-            metric_alias = wrap_list(series.name)[0] if is_transposed else key[0]
             field = fields[metric_alias]
-            data = {
-                RAW_VALUE: raw_value(value, field),
-            }
+            display = display_formatters[metric_alias](value)
+            if display is None:
+                data = {RAW_VALUE: raw_value(value, field)}
+            else:
+                data = {RAW_VALUE: raw_value(value, field), DISPLAY_VALUE: display}
+
             if not row_colors:
                 # No color for this field yet
                 rule = find_rule_to_apply(self.formatting_rules_map[metric_alias], value)
@@ -569,30 +712,35 @@ class ReactTable(Pandas):
                         # No transposing or pivoting going on so set as row color if it's specified for the rule
                         row_colors = colors
 
-            display = _display_value(value, field, date_as=return_none)
-            if display is not None:
-                data["display"] = display
-
-            accessor = self._get_row_value_accessor(series, fields, key)
-            setdeepattr(row, accessor, data)
+            parent = row
+            for parent_key in parent_keys:
+                parent = parent.setdefault(parent_key, {})
+            parent[key] = data
+            cells.append(data)
 
         # Assign the row colors to fields that aren't colored yet
         if row_colors:
-            for key in series.keys():
-                accessor = self._get_row_value_accessor(series, fields, wrap_list(key))
-                data = getdeepattr(row, accessor)
+            for data in cells:
                 if "color" not in data:
                     data["color"], data["text_color"] = row_colors
 
         return row, row_colors
 
-    def calculate_min_max(self, df, is_transposed):
+    def calculate_min_max(self, column_values, metric_aliases, is_transposed):
+        """
+        :param column_values:
+            A list with the values of each column in the result set data frame.
+        :param metric_aliases:
+            The metric alias for each column or, if the table is transposed, for each row.
+        :param is_transposed:
+            Whether the table is transposed or not.
+        """
         if not self.min_max_map:
             return
 
-        for index, series in df.iterrows():
-            for key, value in series.items():
-                metric_alias = wrap_list(series.name)[0] if is_transposed else wrap_list(key)[0]
+        for column_number, values in enumerate(column_values):
+            aliases = metric_aliases if is_transposed else repeat(metric_aliases[column_number])
+            for metric_alias, value in zip(aliases, values):
                 min_max = self.min_max_map.get(metric_alias)
                 if min_max is not None:  # we need to calculate the min and max values for this metric.
                     if value < min_max[0]:
@@ -627,13 +775,6 @@ class ReactTable(Pandas):
         """
         index_names = data_frame.index.names
 
-        def _get_field_label(alias):
-            if alias not in field_map:
-                return alias
-
-            field = field_map[alias]
-            return getattr(field, "label", field.alias)
-
         # If the metric column was dropped due to only having a single metric, add it back here so the
         # formatting can be applied.
         if hasattr(data_frame, "name"):
@@ -645,21 +786,87 @@ class ReactTable(Pandas):
                 axis=1,
             )
 
-        self.calculate_min_max(data_frame, is_transposed)
+        # Extract the index levels and the columns as plain python lists once, instead of boxing each row into a
+        # series. Everything that only depends on the column is resolved up front as well.
+        index_levels = [
+            data_frame.index.get_level_values(level).tolist()
+            for level in range(data_frame.index.nlevels)
+        ]
+        column_names = data_frame.columns.names or []
+        column_keys = [wrap_list(column) for column in data_frame.columns]
+        column_accessors = [
+            (tuple(accessor[:-1]), accessor[-1])
+            for accessor in (
+                self._get_column_accessor(column_names, field_map, key)
+                for key in column_keys
+            )
+        ]
+        column_values = [
+            data_frame.iloc[:, column_number].tolist()
+            for column_number in range(len(column_keys))
+        ]
+
+        formatted_date_levels = self.format_date_index_levels(data_frame.index, field_map)
+        index_level_fields = self.map_index_level_fields(
+            index_names, field_map, dimension_hyperlink_templates, hide_aliases
+        )
+
+        # Hidden dimensions can only be left out of the rows if they are in the rows, which they are not when the table
+        # is transposed or when the dimension is not part of the query. Hiding them is not supported then.
+        if len(data_frame):
+            row_aliases = {alias for alias in index_names if alias is not None and alias in field_map}
+            for f_dimension_alias in hide_aliases:
+                if f_dimension_alias not in row_aliases:
+                    raise KeyError(f_dimension_alias)
+
+        # When transposed, the metrics are in the first index level instead of the first column level
+        metric_aliases = index_levels[0] if is_transposed else [key[0] for key in column_keys]
+
+        # Get the values of the index for the rows. These can be metrics or dimensions so, when transposed, any values
+        # found in the field map are replaced with the label of the field. This is done once per index level.
+        if is_transposed:
+            field_labels = {
+                alias: getattr(field, "label", field.alias)
+                for alias, field in field_map.items()
+            }
+            row_index_levels = [
+                [field_labels.get(value, value) for value in level_values]
+                for level_values in index_levels
+            ]
+        else:
+            row_index_levels = index_levels
+
+        self.calculate_min_max(column_values, metric_aliases, is_transposed)
+
+        # The formatting of each metric is resolved once, instead of once per cell
+        display_formatters = {
+            metric_alias: _display_value_formatter(field_map[metric_alias], date_as=return_none)
+            for metric_alias in set(metric_aliases)
+        }
+
+        value_rows = (
+            zip(*column_values) if column_values else repeat((), len(data_frame))
+        )
 
         rows = []
-        for index, series in data_frame.iterrows():
-            row_values, row_colors = self.transform_row_values(series, field_map, is_transposed, is_pivoted)
-
-            index = wrap_list(index)
-            # Get a list of values from the index. These can be metrics or dimensions so it checks in the item map if
-            # there is a display value for the value
-            index_values = (
-                [_get_field_label(value) for value in index] if is_transposed else index
+        for row_number, (index_values, values) in enumerate(zip(zip(*row_index_levels), value_rows)):
+            row_values, row_colors = self.transform_row_values(
+                values,
+                repeat(metric_aliases[row_number]) if is_transposed else metric_aliases,
+                column_accessors,
+                field_map,
+                display_formatters,
+                is_transposed,
+                is_pivoted,
             )
+
             index_display_values = OrderedDict(zip(index_names, index_values))
+            formatted_index_values = {
+                f_dimension_alias: formatted_level[row_number]
+                for f_dimension_alias, formatted_level in formatted_date_levels.items()
+            }
             row_index = self.transform_row_index(
-                index_display_values, field_map, dimension_hyperlink_templates, hide_aliases, row_colors
+                index_display_values, index_level_fields, row_colors, formatted_index_values
             )
             rows.append(
                 {
@@ -694,24 +901,20 @@ class ReactTable(Pandas):
             Don't add prefix or postfix to values.
         :return:
             An dict containing attributes `columns` and `data` which align with the props in ReactTable with the same
-            names.
+            names. If `data_as_json` is set, `data` is replaced by `data_json`, the data serialized to UTF-8 JSON.
         """
-        result_df = data_frame.copy()
+        # The selector of each dimension is only built once and reused below
+        f_dimension_aliases = [alias_selector(dimension.alias) for dimension in dimensions]
+        dimension_map = dict(zip(f_dimension_aliases, dimensions))
 
-        dimension_map = {
-            alias_selector(dimension.alias): dimension for dimension in dimensions
-        }
+        # The reference alias of each item is computed once, for both the key and the reference item
+        metric_map = OrderedDict()
+        for item in self.items:
+            metric_map[alias_selector(item.alias)] = item
 
-        metric_map = OrderedDict(
-            [
-                (
-                    alias_selector(reference_alias(item, ref)),
-                    ReferenceItem(item, ref) if ref is not None else item,
-                )
-                for item in self.items
-                for ref in [None] + references
-            ]
-        )
+            for ref in references:
+                ref_alias = reference_alias(item, ref)
+                metric_map[alias_selector(ref_alias)] = ReferenceItem(item, ref, alias=ref_alias)
 
         field_map = {
             **metric_map,
@@ -721,7 +924,7 @@ class ReactTable(Pandas):
             TEXT_TOTALS: TotalsItem,
             DATE_TOTALS: TotalsItem,
             TOTALS_LABEL: TotalsItem,
-            alias_selector(METRICS_DIMENSION_ALIAS): Field(
+            F_METRICS_DIMENSION_ALIAS: Field(
                 METRICS_DIMENSION_ALIAS, None, data_type=DataType.text, label=""
             ),
         }
@@ -731,17 +934,29 @@ class ReactTable(Pandas):
             alias_selector(dimension.alias) for dimension in self.hide
         }
 
-        for dimension in dimensions:
+        for f_dimension_alias, dimension in zip(f_dimension_aliases, dimensions):
             if dimension.fetch_only:
-                hide_aliases.add(alias_selector(dimension.alias))
+                hide_aliases.add(f_dimension_alias)
 
         pivot_dimensions = [
-            alias_selector(dimension.alias)
-            for dimension in self.pivot
-            if alias_selector(dimension.alias) not in hide_aliases
+            f_dimension_alias
+            for f_dimension_alias in (alias_selector(dimension.alias) for dimension in self.pivot)
+            if f_dimension_alias not in hide_aliases
         ]
 
-        result_df = self.format_data_frame(result_df[metric_aliases])
+        # Selecting the metric columns creates a new data frame, so only do it when the data frame contains other
+        # columns as well. No further copy of the data is needed, since the rows are built from the column values.
+        if list(data_frame.columns) != metric_aliases:
+            data_frame = data_frame[metric_aliases]
+        result_df = self.format_data_frame(data_frame)
+
+        if not pivot_dimensions and not self.transpose and len(result_df) == 0:
+            # There are no rows to transform, but the column headers are still needed
+            columns = self.transform_index_column_headers(
+                result_df, field_map, hide_aliases
+            ) + self.transform_data_column_headers(result_df, field_map)
+            return self._make_result(columns, [])
+
         result_df, is_pivoted, is_transposed = self.pivot_data_frame(result_df, pivot_dimensions, self.transpose)
         dimension_columns = self.transform_index_column_headers(result_df, field_map, hide_aliases)
         metric_columns = self.transform_data_column_headers(result_df, field_map)
@@ -755,4 +970,10 @@ class ReactTable(Pandas):
             is_pivoted=is_pivoted,
         )
 
-        return {"columns": dimension_columns + metric_columns, "data": data}
+        return self._make_result(dimension_columns + metric_columns, data)
+
+    def _make_result(self, columns, data):
+        if self.data_as_json:
+            return {"columns": columns, "data_json": dump_json(data)}
+
+        return {"columns": columns, "data": data}